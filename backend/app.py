@@ -12,22 +12,57 @@ Author: Blue Schools Project
 Date: 2026
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Dict, List, Optional
+from fastapi.responses import ORJSONResponse, Response
+from contextlib import asynccontextmanager
+from pydantic import BaseModel, Field
+from typing import Annotated, Dict, List, Optional, Tuple
+import msgspec
+import orjson
 import uvicorn
+import os
+import time
 from datetime import datetime
 
 from bayesian_model import BoreholeWaterQualityModel
 
+# The Bayesian model (singleton), built on startup by lifespan()
+bayesian_model: Optional[BoreholeWaterQualityModel] = None
+
+# Serialized /predict-pump response for each pump age, built by lifespan()
+pump_status_bodies: Tuple[bytes, ...] = ()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the model and the precomputed pump responses on startup.
+    """
+    global bayesian_model, pump_status_bodies
+    
+    # Build the network (and its posterior tables) before serving, then
+    # run each prediction path once so the first request isn't slower
+    bayesian_model = BoreholeWaterQualityModel()
+    bayesian_model.predict_contamination_risk({'Rainfall': 0})
+    bayesian_model.predict_pump_status(0)
+    
+    pump_status_bodies = tuple(
+        orjson.dumps(_pump_status_content(pump_age)) for pump_age in range(3)
+    )
+    
+    yield
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Blue Schools Water Quality API",
     description="Bayesian Decision Support System for monitoring water quality in Nigerian school boreholes",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS for mobile app access
@@ -39,66 +74,94 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize the Bayesian model (singleton)
-bayesian_model = BoreholeWaterQualityModel()
-
 # ============================================================================
 # PYDANTIC MODELS (Request/Response Schemas)
 # ============================================================================
 
-class ObservationInput(BaseModel):
+# Observation fields are validated by msgspec while decoding the request
+# body, which is much cheaper than building a Pydantic model per request.
+RainfallLevel = Annotated[int, msgspec.Meta(ge=0, le=2, description="Rainfall level: 0=Low, 1=Medium, 2=High")]
+TurbidityLevel = Annotated[int, msgspec.Meta(ge=0, le=2, description="Water clarity: 0=Clear, 1=Slightly Cloudy, 2=Very Cloudy")]
+RunoffLevel = Annotated[int, msgspec.Meta(ge=0, le=1, description="Surface runoff: 0=No, 1=Yes")]
+LatrineLevel = Annotated[int, msgspec.Meta(ge=0, le=1, description="Latrine proximity: 0=Safe (>30m), 1=Risky (<30m)")]
+PumpAgeLevel = Annotated[int, msgspec.Meta(ge=0, le=2, description="Pump age: 0=New (<2yr), 1=Medium (2-5yr), 2=Old (>5yr)")]
+
+
+class ObservationInput(msgspec.Struct):
     """
     Input model for water quality observations.
     """
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "rainfall": 2,
-                "turbidity": 1,
-                "latrine_distance": 0,
-                "school_name": "Government Primary School Kano",
-                "location": "Kano City",
-                "reporter_name": "Musa Ahmed"
+    rainfall: Optional[RainfallLevel] = None
+    turbidity: Optional[TurbidityLevel] = None
+    surface_runoff: Optional[RunoffLevel] = None
+    latrine_distance: Optional[LatrineLevel] = None
+    pump_age: Optional[PumpAgeLevel] = None
+    
+    school_name: Optional[str] = None
+    location: Optional[str] = None
+    reporter_name: Optional[str] = None
+
+
+class BatchPredictionInput(msgspec.Struct):
+    """
+    Input model for a combined contamination and pump prediction.
+    """
+    obs: ObservationInput
+    pump_age: PumpAgeLevel
+
+
+# OpenAPI request bodies for endpoints that decode their input themselves
+OBSERVATION_SCHEMA = msgspec.json.schema_components([ObservationInput])[1]["ObservationInput"]
+OBSERVATION_EXAMPLE = {
+    "rainfall": 2,
+    "turbidity": 1,
+    "latrine_distance": 0,
+    "school_name": "Government Primary School Kano",
+    "location": "Kano City",
+    "reporter_name": "Musa Ahmed"
+}
+
+OBSERVATION_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": OBSERVATION_SCHEMA,
+                "example": OBSERVATION_EXAMPLE
             }
         }
-    )
-    
-    rainfall: Optional[int] = Field(
-        None,
-        ge=0,
-        le=2,
-        description="Rainfall level: 0=Low, 1=Medium, 2=High"
-    )
-    turbidity: Optional[int] = Field(
-        None,
-        ge=0,
-        le=2,
-        description="Water clarity: 0=Clear, 1=Slightly Cloudy, 2=Very Cloudy"
-    )
-    surface_runoff: Optional[int] = Field(
-        None,
-        ge=0,
-        le=1,
-        description="Surface runoff: 0=No, 1=Yes"
-    )
-    latrine_distance: Optional[int] = Field(
-        None,
-        ge=0,
-        le=1,
-        description="Latrine proximity: 0=Safe (>30m), 1=Risky (<30m)"
-    )
-    pump_age: Optional[int] = Field(
-        None,
-        ge=0,
-        le=2,
-        description="Pump age: 0=New (<2yr), 1=Medium (2-5yr), 2=Old (>5yr)"
-    )
-    
-    school_name: Optional[str] = Field(None, description="Name of the school")
-    location: Optional[str] = Field(None, description="School location")
-    reporter_name: Optional[str] = Field(None, description="Name of person reporting")
+    }
+}
+
+BATCH_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "obs": OBSERVATION_SCHEMA,
+                        "pump_age": {
+                            "type": "integer",
+                            "minimum": 0,
+                            "maximum": 2,
+                            "description": "Pump age: 0=New (<2yr), 1=Medium (2-5yr), 2=Old (>5yr)"
+                        }
+                    },
+                    "required": ["obs", "pump_age"]
+                },
+                "example": {"obs": OBSERVATION_EXAMPLE, "pump_age": 1}
+            }
+        }
+    }
+}
 
 
+# Response models document the API schema only. Endpoints return
+# ORJSONResponse objects directly, which skips jsonable_encoder and
+# response revalidation.
+
 class ContaminationRiskResponse(BaseModel):
     """
     Response model for contamination risk assessment.
@@ -123,6 +186,14 @@ class PumpStatusResponse(BaseModel):
     pump_age_category: str
 
 
+class BatchPredictionResponse(BaseModel):
+    """
+    Response model for a combined contamination and pump prediction.
+    """
+    contamination: ContaminationRiskResponse
+    pump: PumpStatusResponse
+
+
 class HealthCheckResponse(BaseModel):
     """
     Response model for API health check.
@@ -151,30 +222,42 @@ async def root():
     """
     Root endpoint with API information.
     """
-    return {
+    return ORJSONResponse(content={
         "message": "Blue Schools Water Quality Monitoring API",
         "version": "1.0.0",
         "documentation": "/docs",
         "health_check": "/health",
         "github": "https://github.com/blue-schools/bayesian-ai"
-    }
+    })
 
 
-@app.get("/health", response_model=HealthCheckResponse, tags=["General"])
+@app.get("/health", responses={200: {"model": HealthCheckResponse}}, tags=["General"])
 async def health_check():
     """
     Check if API is running and model is loaded.
     """
-    return HealthCheckResponse(
-        status="healthy",
-        timestamp=datetime.now().isoformat(),
-        model_loaded=bayesian_model is not None,
-        api_version="1.0.0"
-    )
+    # The body only changes with the timestamp, so re-serialize it at most
+    # once per second
+    timestamp = _now_iso()
+    if timestamp != _health_cache[0]:
+        _health_cache[0] = timestamp
+        _health_cache[1] = orjson.dumps({
+            "status": "healthy",
+            "timestamp": timestamp,
+            "model_loaded": bayesian_model is not None,
+            "api_version": "1.0.0"
+        })
+    
+    return Response(content=_health_cache[1], media_type="application/json")
 
 
-@app.post("/predict", response_model=ContaminationRiskResponse, tags=["Prediction"])
-async def predict_contamination(observation: ObservationInput):
+@app.post(
+    "/predict",
+    responses={200: {"model": ContaminationRiskResponse}},
+    openapi_extra=OBSERVATION_REQUEST_BODY,
+    tags=["Prediction"]
+)
+async def predict_contamination(request: Request):
     """
     Predict water contamination risk based on observations.
     
@@ -191,53 +274,54 @@ async def predict_contamination(observation: ObservationInput):
     }
     ```
     """
+    # Stays async: the body is awaited and the prediction itself is a
+    # precomputed lookup, so nothing here blocks the event loop
+    observation = _decode_body(await request.body(), ObservationInput)
+    
     try:
-        # Build evidence dictionary (only include non-None values)
-        evidence = {}
-        
-        if observation.rainfall is not None:
-            evidence['Rainfall'] = observation.rainfall
-        if observation.turbidity is not None:
-            evidence['Turbidity'] = observation.turbidity
-        if observation.surface_runoff is not None:
-            evidence['Surface_Runoff'] = observation.surface_runoff
-        if observation.latrine_distance is not None:
-            evidence['Latrine_Dist'] = observation.latrine_distance
-        
-        # Check if we have at least one observation
-        if not evidence:
-            raise HTTPException(
-                status_code=400,
-                detail="At least one observation (rainfall, turbidity, surface_runoff, or latrine_distance) must be provided"
-            )
-        
-        # Get prediction from model
-        result = bayesian_model.predict_contamination_risk(evidence)
-        
-        # Generate recommendation based on risk level
-        recommendation = _generate_recommendation(
-            result['risk_level'],
-            result['contamination_probability']
-        )
-        
-        # Determine confidence based on number of observations
-        confidence = _calculate_confidence(len(evidence))
-        
-        return ContaminationRiskResponse(
-            safe_probability=result['safe_probability'],
-            contamination_probability=result['contamination_probability'],
-            risk_level=result['risk_level'],
-            recommendation=recommendation,
-            evidence_used=evidence,
-            timestamp=datetime.now().isoformat(),
-            confidence=confidence
-        )
+        return ORJSONResponse(content=_contamination_content(observation))
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 
-@app.post("/predict-pump", response_model=PumpStatusResponse, tags=["Prediction"])
+@app.post(
+    "/predict-batch",
+    responses={200: {"model": BatchPredictionResponse}},
+    openapi_extra=BATCH_REQUEST_BODY,
+    tags=["Prediction"]
+)
+async def predict_batch(request: Request):
+    """
+    Predict contamination risk and pump status in a single request.
+    
+    Saves a round trip for clients that need both assessments.
+    
+    **Example Request:**
+    ```json
+    {
+        "obs": {"rainfall": 2, "turbidity": 1},
+        "pump_age": 1
+    }
+    ```
+    """
+    batch = _decode_body(await request.body(), BatchPredictionInput)
+    
+    try:
+        return ORJSONResponse(content={
+            "contamination": _contamination_content(batch.obs),
+            "pump": _pump_status_content(batch.pump_age)
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch prediction error: {str(e)}")
+
+
+@app.post("/predict-pump", responses={200: {"model": PumpStatusResponse}}, tags=["Prediction"])
 async def predict_pump_status(
     pump_age: int = Query(..., ge=0, le=2, description="Pump age: 0=New (<2yr), 1=Medium (2-5yr), 2=Old (>5yr)")
 ):
@@ -249,49 +333,19 @@ async def predict_pump_status(
     - 1: Medium (2-5 years)
     - 2: Old (>5 years)
     """
-    try:
-        result = bayesian_model.predict_pump_status(pump_age)
-        
-        age_categories = ["New (<2 years)", "Medium (2-5 years)", "Old (>5 years)"]
-        
-        # Generate maintenance recommendation
-        if result['failure_probability'] > 0.2:
-            recommendation = "⚠️ URGENT: Schedule immediate inspection and maintenance"
-        elif result['failure_probability'] > 0.1:
-            recommendation = "⚡ IMPORTANT: Plan maintenance within next 2 weeks"
-        else:
-            recommendation = "✅ GOOD: Continue routine monitoring"
-        
-        return PumpStatusResponse(
-            working_probability=result['working_probability'],
-            failure_probability=result['failure_probability'],
-            maintenance_needed=result['maintenance_needed'],
-            recommendation=recommendation,
-            pump_age_category=age_categories[pump_age]
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Pump prediction error: {str(e)}")
+    # Only 3 possible responses, serialized once at startup
+    return Response(content=pump_status_bodies[pump_age], media_type="application/json")
 
 
-@app.get("/variables", response_model=VariableInfoResponse, tags=["Information"])
+@app.get("/variables", responses={200: {"model": VariableInfoResponse}}, tags=["Information"])
 async def get_variable_info():
     """
     Get information about all variables in the Bayesian model.
     
     Returns variable names, possible states, and descriptions.
     """
-    try:
-        variables = bayesian_model.get_variable_info()
-        
-        return VariableInfoResponse(
-            variables=variables,
-            total_nodes=len(bayesian_model.model.nodes()),
-            total_edges=len(bayesian_model.model.edges())
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching variables: {str(e)}")
+    # Serialized once when the model is built
+    return Response(content=bayesian_model.variables_json, media_type="application/json")
 
 
 @app.get("/model-structure", tags=["Information"])
@@ -301,38 +355,22 @@ async def get_model_structure():
     
     Returns nodes and edges for visualization.
     """
-    try:
-        nodes = list(bayesian_model.model.nodes())
-        edges = list(bayesian_model.model.edges())
-        
-        return {
-            "nodes": nodes,
-            "edges": [{"from": edge[0], "to": edge[1]} for edge in edges],
-            "description": "Causal relationships in the water quality model"
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching structure: {str(e)}")
+    # Serialized once when the model is built
+    return Response(content=bayesian_model.structure_json, media_type="application/json")
 
 
-@app.post("/sensitivity-analysis", tags=["Analysis"])
-async def analyze_sensitivity(observation: ObservationInput):
+@app.post("/sensitivity-analysis", openapi_extra=OBSERVATION_REQUEST_BODY, tags=["Analysis"])
+async def analyze_sensitivity(request: Request):
     """
     Perform sensitivity analysis to identify most impactful variables.
     
     Shows which observations have the biggest effect on contamination risk.
     """
+    observation = _decode_body(await request.body(), ObservationInput)
+    
     try:
         # Build evidence dictionary
-        evidence = {}
-        if observation.rainfall is not None:
-            evidence['Rainfall'] = observation.rainfall
-        if observation.turbidity is not None:
-            evidence['Turbidity'] = observation.turbidity
-        if observation.surface_runoff is not None:
-            evidence['Surface_Runoff'] = observation.surface_runoff
-        if observation.latrine_distance is not None:
-            evidence['Latrine_Dist'] = observation.latrine_distance
+        evidence = _build_evidence(observation)
         
         if not evidence:
             raise HTTPException(status_code=400, detail="At least one observation required")
@@ -342,12 +380,14 @@ async def analyze_sensitivity(observation: ObservationInput):
         # Rank by impact
         ranked = sorted(sensitivity.items(), key=lambda x: x[1], reverse=True)
         
-        return {
+        return ORJSONResponse(content={
             "sensitivity_scores": sensitivity,
             "most_impactful": ranked[0][0] if ranked else None,
             "ranked_variables": [{"variable": var, "impact": score} for var, score in ranked]
-        }
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Sensitivity analysis error: {str(e)}")
 
@@ -356,18 +396,128 @@ async def analyze_sensitivity(observation: ObservationInput):
 # HELPER FUNCTIONS
 # ============================================================================
 
-def _generate_recommendation(risk_level: str, probability: float) -> str:
+def _decode_body(body: bytes, input_type: type):
+    """
+    Decode and validate a msgspec input model from a raw JSON request body.
+    
+    Decodes in lax mode, so numeric strings and whole floats ("2", 2.0)
+    are accepted for integer fields, as they were with Pydantic.
+    """
+    try:
+        return msgspec.json.decode(body, type=input_type, strict=False)
+    except (msgspec.ValidationError, msgspec.DecodeError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid request body: {str(e)}")
+
+
+# Model variable names, in the same order as the observation fields
+# collected by _build_evidence
+EVIDENCE_KEYS = ('Rainfall', 'Turbidity', 'Surface_Runoff', 'Latrine_Dist')
+
+
+def _build_evidence(observation: ObservationInput) -> Dict[str, int]:
     """
-    Generate actionable recommendation based on risk level.
+    Map the provided observation fields to model evidence (skips None values).
+    """
+    values = (
+        observation.rainfall,
+        observation.turbidity,
+        observation.surface_runoff,
+        observation.latrine_distance
+    )
+    return {key: value for key, value in zip(EVIDENCE_KEYS, values) if value is not None}
+
+
+def _contamination_content(observation: ObservationInput) -> Dict:
     """
-    recommendations = {
-        "LOW": "✅ Water appears safe. Continue routine monitoring.",
-        "MODERATE": "⚠️ CAUTION: Consider boiling water or using water purification tablets. Monitor closely.",
-        "HIGH": "🚨 WARNING: Do NOT drink without treatment. Boil water for at least 3 minutes or use chlorine treatment.",
-        "CRITICAL": "🔴 DANGER: Water likely contaminated. DO NOT USE for drinking or cooking. Contact health authorities immediately."
+    Build the contamination risk response body for an observation.
+    """
+    # Build evidence dictionary (only include non-None values)
+    evidence = _build_evidence(observation)
+    
+    # Check if we have at least one observation
+    if not evidence:
+        raise HTTPException(
+            status_code=400,
+            detail="At least one observation (rainfall, turbidity, surface_runoff, or latrine_distance) must be provided"
+        )
+    
+    # Get prediction from model
+    result = bayesian_model.predict_contamination_risk(evidence)
+    
+    # Generate recommendation based on risk level
+    recommendation = _generate_recommendation(result['risk_code'])
+    
+    # Determine confidence based on number of observations
+    confidence = _calculate_confidence(len(evidence))
+    
+    return {
+        "safe_probability": result['safe_probability'],
+        "contamination_probability": result['contamination_probability'],
+        "risk_level": result['risk_level'],
+        "recommendation": recommendation,
+        "evidence_used": evidence,
+        "timestamp": _now_iso(),
+        "confidence": confidence
     }
+
+
+# Recommendations indexed by risk code (LOW, MODERATE, HIGH, CRITICAL)
+_RECOMMENDATIONS = (
+    "✅ Water appears safe. Continue routine monitoring.",
+    "⚠️ CAUTION: Consider boiling water or using water purification tablets. Monitor closely.",
+    "🚨 WARNING: Do NOT drink without treatment. Boil water for at least 3 minutes or use chlorine treatment.",
+    "🔴 DANGER: Water likely contaminated. DO NOT USE for drinking or cooking. Contact health authorities immediately."
+)
+
+
+def _generate_recommendation(risk_code: int) -> str:
+    """
+    Generate actionable recommendation based on risk level code.
+    """
+    return _RECOMMENDATIONS[risk_code]
+
+
+# [epoch second, ISO string] of the last formatted timestamp
+_ts_cache = [0, ""]
+
+# [timestamp, serialized body] of the last /health response
+_health_cache = ["", b""]
+
+
+def _now_iso() -> str:
+    """
+    Get the current time as an ISO string, formatted at most once per second.
+    """
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = datetime.fromtimestamp(now).isoformat()
+    return _ts_cache[1]
+
+
+def _pump_status_content(pump_age: int) -> Dict:
+    """
+    Build the /predict-pump response body for a pump age.
+    """
+    result = bayesian_model.predict_pump_status(pump_age)
+    
+    age_categories = ["New (<2 years)", "Medium (2-5 years)", "Old (>5 years)"]
+    
+    # Generate maintenance recommendation
+    if result['failure_probability'] > 0.2:
+        recommendation = "⚠️ URGENT: Schedule immediate inspection and maintenance"
+    elif result['failure_probability'] > 0.1:
+        recommendation = "⚡ IMPORTANT: Plan maintenance within next 2 weeks"
+    else:
+        recommendation = "✅ GOOD: Continue routine monitoring"
     
-    return recommendations.get(risk_level, "Monitor water quality closely")
+    return {
+        "working_probability": result['working_probability'],
+        "failure_probability": result['failure_probability'],
+        "maintenance_needed": result['maintenance_needed'],
+        "recommendation": recommendation,
+        "pump_age_category": age_categories[pump_age]
+    }
 
 
 def _calculate_confidence(num_observations: int) -> str:
@@ -395,10 +545,16 @@ if __name__ == "__main__":
     print("Health check: http://localhost:8000/health")
     print("=" * 60)
     
+    # Set DEV=1 for auto-reload on code changes (single worker only)
+    dev_mode = bool(os.getenv("DEV"))
+    
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,  # Auto-reload on code changes
-        log_level="info"
+        reload=dev_mode,
+        workers=1 if dev_mode else os.cpu_count(),
+        loop="uvloop",
+        http="httptools",
+        log_level="info" if dev_mode else "warning"
     )
@@ -1,8 +1,10 @@
 from pgmpy.models import DiscreteBayesianNetwork
 from pgmpy.factors.discrete import TabularCPD
-from pgmpy.inference import VariableElimination
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from itertools import combinations, product
+from bisect import bisect_right
 import numpy as np
+import orjson
 
 
 class BoreholeWaterQualityModel:
@@ -16,11 +18,50 @@ class BoreholeWaterQualityModel:
     - Target outcome (Contamination Risk)
     """
     
+    # Observable variables that feed the contamination query, with their
+    # number of states
+    EVIDENCE_CARDINALITY = {
+        'Rainfall': 3,
+        'Turbidity': 3,
+        'Surface_Runoff': 2,
+        'Latrine_Dist': 2
+    }
+    
+    # Number of states of every variable in the network
+    CARDINALITY = {
+        **EVIDENCE_CARDINALITY,
+        'Contamination': 2,
+        'Pump_Age': 3,
+        'Pump_Failure': 2
+    }
+    
+    # Axis order of the two independent parts of the network in the joint
+    # distributions built by get_most_likely_scenario
+    CONTAMINATION_VARIABLES = ('Rainfall', 'Turbidity', 'Surface_Runoff', 'Latrine_Dist', 'Contamination')
+    PUMP_VARIABLES = ('Pump_Age', 'Pump_Failure')
+    
+    # Risk categories, indexed by the code returned from _categorize_risk
+    RISK_LEVELS = ('LOW', 'MODERATE', 'HIGH', 'CRITICAL')
+    
+    # Lower probability bound of each risk level above LOW
+    RISK_THRESHOLDS = (0.2, 0.5, 0.8)
+    
+    # Einsum subscript of each observable variable in the contamination joint
+    EINSUM_AXES = {
+        'Rainfall': 'r',
+        'Turbidity': 't',
+        'Surface_Runoff': 's',
+        'Latrine_Dist': 'l'
+    }
+    
     def __init__(self):
         """Initialize the Bayesian network structure and probabilities."""
         self.model = None
-        self.inference_engine = None
+        self._contam_cache = {}
+        self._pump_cache = {}
         self._build_network()
+        self._precompute_posteriors()
+        self._serialize_static_info()
         
     def _build_network(self):
         """
@@ -165,12 +206,148 @@ class BoreholeWaterQualityModel:
         # This checks if the network is valid (DAG, probability sums, etc.)
         assert self.model.check_model(), "Model validation failed!"
         
-        # 6. INITIALIZE INFERENCE ENGINE
-        self.inference_engine = VariableElimination(self.model)
+        # 6. KEEP RAW PROBABILITY TABLES FOR DIRECT INFERENCE
+        # Copied as contiguous float32 arrays (pgmpy stores float64)
+        # Axis order follows the CPD layout: [variable, *evidence]
+        self._p_R = self._as_table(cpd_rainfall)          # [r]
+        self._p_T_R = self._as_table(cpd_turbidity)       # [t, r]
+        self._p_S_R = self._as_table(cpd_runoff)          # [s, r]
+        self._p_L = self._as_table(cpd_latrine)           # [l]
+        self._p_C_TSL = self._as_table(cpd_contamination) # [c, t, s, l]
+        self._p_A = self._as_table(cpd_pump_age)          # [a]
+        self._p_F_A = self._as_table(cpd_pump_failure)    # [f, a]
+        
+        # 7. KEEP THE GRAPH STRUCTURE
+        self._nodes = tuple(self.model.nodes())
+        self._edges = tuple(self.model.edges())
         
         print("✅ Bayesian Network successfully built and validated!")
-        print(f"   Nodes: {len(self.model.nodes())}")
-        print(f"   Edges: {len(self.model.edges())}")
+        print(f"   Nodes: {len(self._nodes)}")
+        print(f"   Edges: {len(self._edges)}")
+        
+        # 8. RELEASE THE PGMPY OBJECTS
+        # pgmpy is only used for validation; inference runs on the raw tables
+        self.model = None
+    
+    def _precompute_posteriors(self):
+        """
+        Run inference once for every possible evidence combination.
+        
+        The evidence space is small (every subset of the observable
+        variables, with every state assignment: 144 combinations), so all
+        contamination posteriors are computed up front and requests become
+        dictionary lookups. The same is done for the 3 pump ages.
+        
+        Every valid query is answered from these read-only tables, so
+        concurrent requests never run inference and there is nothing to
+        batch or deduplicate on the request path.
+        """
+        variables = list(self.EVIDENCE_CARDINALITY)
+        
+        for size in range(len(variables) + 1):
+            for subset in combinations(variables, size):
+                state_ranges = [range(self.EVIDENCE_CARDINALITY[var]) for var in subset]
+                for states in product(*state_ranges):
+                    evidence = dict(zip(subset, states))
+                    safe, contaminated = (
+                        float(p) for p in self._contamination_posterior(evidence)
+                    )
+                    self._contam_cache[frozenset(evidence.items())] = (
+                        safe,
+                        contaminated,
+                        self._categorize_risk(contaminated)
+                    )
+        
+        # Pump_Age is Pump_Failure's only parent, so each posterior is
+        # simply a column of its CPT
+        for pump_age in range(3):
+            probs = np.round(self._p_F_A[:, pump_age].astype(np.float64), 6)
+            working, failed = (float(p) for p in probs)
+            self._pump_cache[pump_age] = (working, failed, failed > 0.15)
+    
+    @staticmethod
+    def _as_table(cpd: TabularCPD) -> np.ndarray:
+        """Copy a CPD's probabilities into a contiguous float32 array."""
+        return np.ascontiguousarray(cpd.values, dtype=np.float32)
+    
+    def _serialize_static_info(self):
+        """
+        Pre-serialize the variable and structure information to JSON bytes.
+        
+        The network never changes after it is built, so the API can return
+        these bodies as-is instead of rebuilding and encoding them per request.
+        """
+        self.variables_json = orjson.dumps({
+            'variables': self.get_variable_info(),
+            'total_nodes': len(self._nodes),
+            'total_edges': len(self._edges)
+        })
+        self.structure_json = orjson.dumps({
+            'nodes': self._nodes,
+            'edges': [{'from': edge[0], 'to': edge[1]} for edge in self._edges],
+            'description': 'Causal relationships in the water quality model'
+        })
+    
+    def _evidence_slice(self, evidence: Dict[str, int], var: str) -> slice:
+        """
+        Select the observed state of a variable, or all states if unobserved.
+        
+        A one-element slice is used (instead of an integer index) so the
+        axis is kept and the einsum subscripts stay the same.
+        """
+        if var not in evidence:
+            return slice(None)
+        
+        state = evidence[var]
+        if not 0 <= state < self.CARDINALITY[var]:
+            raise ValueError(f"Invalid state {state} for variable {var}")
+        
+        return slice(state, state + 1)
+    
+    def _contamination_posterior(
+        self,
+        evidence: Dict[str, int],
+        vary: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Compute P(Contamination | evidence) with a single tensor contraction.
+        
+        Sums the joint P(R) P(T|R) P(S|R) P(L) P(C|T,S,L) over every
+        unobserved variable, then normalizes. Pump variables are independent
+        of Contamination, so evidence on them is ignored.
+        
+        Args:
+            evidence: Dictionary of observed variables
+            vary: Optional evidence variable to sweep over all its states
+                  (its observed value is ignored)
+        
+        Returns:
+            Array of [Safe, Contaminated] probabilities, or with `vary` an
+            array of shape (2, num_states) with one posterior per state
+        """
+        if vary is not None:
+            evidence = {var: state for var, state in evidence.items() if var != vary}
+        
+        r = self._evidence_slice(evidence, 'Rainfall')
+        t = self._evidence_slice(evidence, 'Turbidity')
+        s = self._evidence_slice(evidence, 'Surface_Runoff')
+        l = self._evidence_slice(evidence, 'Latrine_Dist')
+        
+        output = 'c' + (self.EINSUM_AXES[vary] if vary is not None else '')
+        joint = np.einsum(
+            'r,tr,sr,l,ctsl->' + output,
+            self._p_R[r],
+            self._p_T_R[t, r],
+            self._p_S_R[s, r],
+            self._p_L[l],
+            self._p_C_TSL[:, t, s, l]
+        )
+        
+        # Round away float32 noise (keeping float64 output) so posteriors
+        # that equal a risk threshold (e.g. exactly 0.2) are categorized
+        # consistently
+        posterior = (joint / joint.sum(axis=0)).astype(np.float64)
+        return np.round(posterior, 6)
     
     def predict_contamination_risk(
         self,
@@ -187,19 +364,25 @@ class BoreholeWaterQualityModel:
             Dictionary with probabilities for Safe and Contaminated states
         """
         
-        # Run inference
-        result = self.inference_engine.query(
-            variables=['Contamination'],
-            evidence=evidence
-        )
+        # Look up the precomputed posterior
+        cached = self._contam_cache.get(frozenset(evidence.items()))
+        
+        if cached is None:
+            # Evidence outside the precomputed space (e.g. Pump_Age)
+            probs = self._contamination_posterior(evidence)
+            cached = (
+                float(probs[0]),
+                float(probs[1]),
+                self._categorize_risk(float(probs[1]))
+            )
         
-        # Extract probabilities
-        probs = result.values
+        safe, contaminated, risk_code = cached
         
         return {
-            'safe_probability': float(probs[0]),
-            'contamination_probability': float(probs[1]),
-            'risk_level': self._categorize_risk(float(probs[1])),
+            'safe_probability': safe,
+            'contamination_probability': contaminated,
+            'risk_level': self.RISK_LEVELS[risk_code],
+            'risk_code': risk_code,
             'evidence_used': evidence
         }
     
@@ -214,17 +397,12 @@ class BoreholeWaterQualityModel:
             Dictionary with pump status probabilities
         """
         
-        result = self.inference_engine.query(
-            variables=['Pump_Failure'],
-            evidence={'Pump_Age': pump_age}
-        )
-        
-        probs = result.values
+        working, failed, maintenance_needed = self._pump_cache[pump_age]
         
         return {
-            'working_probability': float(probs[0]),
-            'failure_probability': float(probs[1]),
-            'maintenance_needed': probs[1] > 0.15
+            'working_probability': working,
+            'failure_probability': failed,
+            'maintenance_needed': maintenance_needed
         }
     
     def get_most_likely_scenario(self, evidence: Dict[str, int]) -> Dict:
@@ -238,39 +416,46 @@ class BoreholeWaterQualityModel:
             Most probable values for unobserved variables
         """
         
-        # Get all variables
-        all_vars = set(self.model.nodes())
-        unobserved = all_vars - set(evidence.keys())
+        r, t, s, l, c = (self._evidence_slice(evidence, var) for var in self.CONTAMINATION_VARIABLES)
+        a, f = (self._evidence_slice(evidence, var) for var in self.PUMP_VARIABLES)
+        
+        # Joint distribution of each part of the network, restricted to the
+        # evidence (the two parts are independent of each other)
+        contamination_joint = np.einsum(
+            'r,tr,sr,l,ctsl->rtslc',
+            self._p_R[r],
+            self._p_T_R[t, r],
+            self._p_S_R[s, r],
+            self._p_L[l],
+            self._p_C_TSL[c, t, s, l]
+        )
+        pump_joint = np.einsum('a,fa->af', self._p_A[a], self._p_F_A[f, a])
         
         results = {}
-        for var in unobserved:
-            query_result = self.inference_engine.query(
-                variables=[var],
-                evidence=evidence
-            )
-            most_probable_state = int(np.argmax(query_result.values))
-            results[var] = most_probable_state
+        for joint, variables in ((contamination_joint, self.CONTAMINATION_VARIABLES),
+                                 (pump_joint, self.PUMP_VARIABLES)):
+            for axis, var in enumerate(variables):
+                if var in evidence:
+                    continue
+                
+                # Marginalize out every other variable, then take the mode
+                other_axes = tuple(i for i in range(joint.ndim) if i != axis)
+                results[var] = int(joint.sum(axis=other_axes).argmax())
         
         return results
     
-    def _categorize_risk(self, prob: float) -> str:
+    def _categorize_risk(self, prob: float) -> int:
         """
-        Convert probability to human-readable risk level.
+        Convert probability to a risk level code.
         
         Args:
             prob: Contamination probability (0-1)
         
         Returns:
-            Risk category string
+            Risk code: 0=LOW (<0.2), 1=MODERATE (<0.5), 2=HIGH (<0.8),
+            3=CRITICAL; see RISK_LEVELS for the names
         """
-        if prob < 0.2:
-            return "LOW"
-        elif prob < 0.5:
-            return "MODERATE"
-        elif prob < 0.8:
-            return "HIGH"
-        else:
-            return "CRITICAL"
+        return bisect_right(self.RISK_THRESHOLDS, prob)
     
     def get_variable_info(self) -> Dict:
         """
@@ -324,36 +509,25 @@ class BoreholeWaterQualityModel:
         # This is a simplified sensitivity analysis
         # For production, use more sophisticated methods
         
-        base_result = self.inference_engine.query(
-            variables=[target],
-            evidence=evidence
-        )
-        base_prob = base_result.values[1]  # Contaminated probability
+        if target != 'Contamination':
+            raise ValueError(f"Sensitivity analysis is not supported for {target}")
+        
+        base_prob = self._contamination_posterior(evidence)[1]  # Contaminated probability
         
         sensitivity = {}
         
-        # Test impact of each evidence variable
+        # Test impact of each evidence variable: one contraction gives the
+        # contamination probability for every state of the variable at once
         for var in evidence.keys():
-            temp_evidence = evidence.copy()
-            
-            # Try flipping to different state
-            original_state = temp_evidence[var]
-            variable_info = self.get_variable_info()
-            num_states = len(variable_info[var]['states'])
+            if var not in self.EVIDENCE_CARDINALITY:
+                # Independent of Contamination (pump variables)
+                sensitivity[var] = 0.0
+                continue
             
-            impacts = []
-            for state in range(num_states):
-                if state != original_state:
-                    temp_evidence[var] = state
-                    new_result = self.inference_engine.query(
-                        variables=[target],
-                        evidence=temp_evidence
-                    )
-                    new_prob = new_result.values[1]
-                    impact = abs(new_prob - base_prob)
-                    impacts.append(impact)
+            state_probs = self._contamination_posterior(evidence, vary=var)[1]
             
-            sensitivity[var] = max(impacts) if impacts else 0.0
+            # The observed state itself contributes zero impact
+            sensitivity[var] = float(np.abs(state_probs - base_prob).max())
         
         return sensitivity
 
@@ -0,0 +1,63 @@
+"""
+Tests for the Blue Schools Water Quality API.
+
+Run from the backend directory: `pytest test_app.py`
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    # Entering the client runs lifespan(), which builds the model
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_predict_batch_returns_both_assessments(client):
+    response = client.post("/predict-batch", json={"obs": {"rainfall": 2, "turbidity": 1}, "pump_age": 1})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"contamination", "pump"}
+    assert body["pump"]["pump_age_category"] == "Medium (2-5 years)"
+
+
+def test_predict_batch_without_observations_is_bad_request(client):
+    response = client.post("/predict-batch", json={"obs": {}, "pump_age": 0})
+
+    assert response.status_code == 400
+    assert "At least one observation" in response.json()["detail"]
+
+
+def test_predict_without_observations_is_bad_request(client):
+    response = client.post("/predict", json={})
+
+    assert response.status_code == 400
+    assert "At least one observation" in response.json()["detail"]
+
+
+def test_sensitivity_analysis_without_observations_is_bad_request(client):
+    response = client.post("/sensitivity-analysis", json={})
+
+    assert response.status_code == 400
+    assert "At least one observation" in response.json()["detail"]
+
+
+def test_predict_accepts_numeric_strings_and_whole_floats(client):
+    expected = client.post("/predict", json={"rainfall": 2}).json()["contamination_probability"]
+
+    for rainfall in ("2", 2.0):
+        response = client.post("/predict", json={"rainfall": rainfall})
+
+        assert response.status_code == 200
+        assert response.json()["contamination_probability"] == expected
+
+
+def test_predict_rejects_out_of_range_level(client):
+    response = client.post("/predict", json={"rainfall": 3})
+
+    assert response.status_code == 422
@@ -0,0 +1,80 @@
+"""
+Regression tests for the Bayesian water quality model.
+
+Expected values come from exact pgmpy variable elimination on the same
+network, so the einsum-based inference and float32 tables can't drift
+unnoticed. Run from the backend directory: `pytest test_bayesian_model.py`
+"""
+
+import pytest
+
+from bayesian_model import BoreholeWaterQualityModel
+
+
+# Posteriors are rounded to 6 decimals by the model
+TOLERANCE = 1e-6
+
+
+@pytest.fixture(scope="module")
+def model():
+    return BoreholeWaterQualityModel()
+
+
+@pytest.mark.parametrize("evidence, contamination, risk_level", [
+    ({'Rainfall': 2, 'Turbidity': 1}, 0.53, 'HIGH'),
+    ({'Rainfall': 0}, 0.063005, 'LOW'),
+    ({'Turbidity': 2}, 0.8303428571, 'CRITICAL'),
+    ({'Surface_Runoff': 1, 'Latrine_Dist': 1}, 0.6524025974, 'HIGH'),
+    ({'Rainfall': 2, 'Turbidity': 2, 'Surface_Runoff': 1, 'Latrine_Dist': 1}, 0.95, 'CRITICAL'),
+])
+def test_contamination_posterior(model, evidence, contamination, risk_level):
+    result = model.predict_contamination_risk(evidence)
+
+    assert result['contamination_probability'] == pytest.approx(contamination, abs=TOLERANCE)
+    assert result['safe_probability'] == pytest.approx(1 - contamination, abs=TOLERANCE)
+    assert result['risk_level'] == risk_level
+
+
+@pytest.mark.parametrize("evidence, contamination, risk_level", [
+    ({'Turbidity': 1, 'Surface_Runoff': 0, 'Latrine_Dist': 0}, 0.2, 'MODERATE'),
+    ({'Rainfall': 1, 'Turbidity': 0, 'Latrine_Dist': 1}, 0.2, 'MODERATE'),
+    ({'Turbidity': 1, 'Surface_Runoff': 1, 'Latrine_Dist': 0}, 0.5, 'HIGH'),
+    ({'Turbidity': 2, 'Surface_Runoff': 0, 'Latrine_Dist': 1}, 0.8, 'CRITICAL'),
+])
+def test_posterior_on_risk_threshold_takes_upper_level(model, evidence, contamination, risk_level):
+    result = model.predict_contamination_risk(evidence)
+
+    assert result['contamination_probability'] == contamination
+    assert result['risk_level'] == risk_level
+
+
+def test_sensitivity_scores(model):
+    scores = model.sensitivity_analysis('Contamination', {'Rainfall': 2, 'Turbidity': 1, 'Latrine_Dist': 1})
+
+    assert scores == pytest.approx({'Rainfall': 0.255, 'Turbidity': 0.395, 'Latrine_Dist': 0.2}, abs=TOLERANCE)
+
+
+@pytest.mark.parametrize("pump_age, working, failed, maintenance_needed", [
+    (0, 0.98, 0.02, False),
+    (1, 0.9, 0.1, False),
+    (2, 0.7, 0.3, True),
+])
+def test_pump_status_table(model, pump_age, working, failed, maintenance_needed):
+    result = model.predict_pump_status(pump_age)
+
+    assert result['working_probability'] == pytest.approx(working, abs=TOLERANCE)
+    assert result['failure_probability'] == pytest.approx(failed, abs=TOLERANCE)
+    assert result['maintenance_needed'] is maintenance_needed
+
+
+def test_most_likely_scenario(model):
+    scenario = model.get_most_likely_scenario({'Turbidity': 2})
+
+    assert scenario == {
+        'Rainfall': 2,
+        'Surface_Runoff': 1,
+        'Latrine_Dist': 0,
+        'Contamination': 1,
+        'Pump_Age': 1,
+        'Pump_Failure': 0
+    }
@@ -11,25 +11,40 @@ Version: 2.0 - Enhanced with Percentage Sliders
 """
 
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 import requests
-import pandas as pd
-import plotly.graph_objects as go
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import httpx
+except ImportError:  # Optional: fall back to requests (HTTP/1.1)
+    httpx = None
+import numpy as np
 from datetime import datetime
+import time
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 import json
+import io
+import copy
 
 # ============================================================================
 # PAGE CONFIGURATION
 # ============================================================================
 
-st.set_page_config(
-    page_title="Blue Schools Water Monitor",
-    page_icon="💧",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+try:
+    st.set_page_config(
+        page_title="Blue Schools Water Monitor",
+        page_icon="💧",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+except StreamlitAPIException:
+    # Page config was already applied (e.g. when the script is embedded)
+    pass
 
 # Custom CSS for better styling
-st.markdown("""
+_CSS = """
     <style>
     .big-font {
         font-size:20px !important;
@@ -76,7 +91,16 @@ st.markdown("""
         margin: 10px 0;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+@st.cache_data(show_spinner=False)
+def _css_blob():
+    """Return the stylesheet from the cache rather than rebuilding it per rerun."""
+    return _CSS
+
+
+st.markdown(_css_blob(), unsafe_allow_html=True)
 
 # ============================================================================
 # API CONFIGURATION
@@ -90,6 +114,96 @@ API_BASE_URL = os.getenv("API_BASE_URL", "https://blue-schools-water-quality-mon
 # HELPER FUNCTIONS
 # ============================================================================
 
+# Initial slider positions (percent), keyed by widget key
+SLIDER_DEFAULTS = {
+    "rainfall_pct": 50,
+    "runoff_pct": 0,
+    "latrine_pct": 100,
+    "turbidity_pct": 0,
+    "pump_age_pct": 0
+}
+
+# Default number of assessments kept in the session history
+HISTORY_MAXLEN = 500
+
+# Risk levels returned by the API, in order; history stores the index.
+# Levels the app does not know are stored as -1 (shown as missing)
+RISK_LEVELS = ('LOW', 'MODERATE', 'HIGH', 'CRITICAL')
+RISK_CODES = {level: code for code, level in enumerate(RISK_LEVELS)}
+UNKNOWN_RISK_CODE = -1
+
+# History storage: numeric fields in a preallocated structured buffer
+# (doubled when full), free-text fields in parallel lists
+HIST_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('rainfall_pct', 'u1'),
+    ('turbidity_pct', 'u1'),
+    ('runoff_pct', 'u1'),
+    ('latrine_pct', 'u1'),
+    ('risk_level', 'i1'),
+    ('probability', 'f4')
+])
+HIST_TEXT_FIELDS = ('school', 'location', 'reporter')
+HISTORY_CAPACITY = 1024
+
+# Column order of the History table and CSV export
+HISTORY_FIELDS = (
+    'timestamp', 'school', 'location', 'reporter',
+    'rainfall_pct', 'turbidity_pct', 'runoff_pct', 'latrine_pct',
+    'risk_level', 'probability'
+)
+
+# Upper bound (inclusive) of each category except the last:
+# 3 categories: 0-33% = 0, 34-66% = 1, 67-100% = 2
+# 2 categories: 0-50% = 0, 51-100% = 1
+_CATEGORY_THRESHOLDS = {3: (33, 66), 2: (50,)}
+
+
+@st.cache_resource
+def _api_session():
+    """Shared HTTP session so API calls reuse pooled connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def _httpx_client():
+    """
+    Shared HTTP/2 client, so concurrent API calls multiplex over one connection.
+    
+    Returns None when httpx (or its h2 extra) is not installed, in which
+    case the requests session is used instead.
+    """
+    if httpx is None:
+        return None
+    try:
+        return httpx.Client(
+            base_url=API_BASE_URL,
+            http2=True,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            limits=httpx.Limits(max_keepalive_connections=10)
+        )
+    except ImportError:
+        return None
+
+
+# Errors reported to the user as "cannot connect" by either HTTP client
+CONNECTION_ERRORS = (requests.exceptions.ConnectionError,) + ((httpx.ConnectError,) if httpx else ())
+
+
+@st.cache_resource
+def _pool():
+    """Shared thread pool for issuing API calls concurrently."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
 def percentage_to_category(percentage, categories):
     """
     Convert percentage (0-100) to discrete category (0, 1, or 2).
@@ -101,20 +215,37 @@ def percentage_to_category(percentage, categories):
     Returns:
         Category index (0, 1, or 2)
     """
-    if categories == 3:
-        # For 3 categories: 0-33% = 0, 34-66% = 1, 67-100% = 2
-        if percentage <= 33:
-            return 0
-        elif percentage <= 66:
-            return 1
-        else:
-            return 2
-    else:  # categories == 2
-        # For 2 categories: 0-50% = 0, 51-100% = 1
-        if percentage <= 50:
-            return 0
-        else:
-            return 1
+    return bisect_left(_CATEGORY_THRESHOLDS.get(categories, (50,)), percentage)
+
+
+def percentage_to_category_vec(percentages, categories):
+    """
+    Vectorized percentage_to_category for arrays of slider values.
+    
+    Args:
+        percentages: Array-like of values from 0-100
+        categories: Number of categories (2 or 3)
+    
+    Returns:
+        NumPy array of category indices
+    """
+    thresholds = _CATEGORY_THRESHOLDS.get(categories, (50,))
+    return np.searchsorted(thresholds, np.asarray(percentages), side='left')
+
+
+# Percentage display under each slider, indexed by percentage
+_PCT_HTML = tuple(
+    '<div class="percentage-display">%d%% - {label}</div>' % pct for pct in range(101)
+)
+
+
+def _pct_html_table(labels, suffix=""):
+    """Finished percentage-display markup for every slider position."""
+    return tuple(html.format(label=label) + suffix for html, label in zip(_PCT_HTML, labels))
+
+# Category for every slider position (0-100), indexed by percentage
+_LUT2 = percentage_to_category_vec(np.arange(101), 2)
+_LUT3 = percentage_to_category_vec(np.arange(101), 3)
 
 
 def get_category_label(percentage, labels):
@@ -133,29 +264,146 @@ def get_category_label(percentage, labels):
     return labels[category_index]
 
 
+# Slider category labels, and the label for every slider position (0-100)
+RAINFALL_LABELS = ("☀️ Low/None (0-33%)", "🌧️ Medium (34-66%)", "⛈️ Heavy (67-100%)")
+RUNOFF_LABELS = ("❌ No runoff (0-50%)", "✅ Runoff present (51-100%)")
+LATRINE_LABELS = ("⚠️ Too close (<30m)", "✅ Safe (>30m)")
+TURBIDITY_LABELS = ("💎 Clear (0-33%)", "☁️ Slightly Cloudy (34-66%)", "🌫️ Very Cloudy (67-100%)")
+PUMP_LABELS = ("🆕 New (<2 years)", "⚙️ Medium (2-5 years)", "🔧 Old (>5 years)")
+
+_RAINFALL_LBL = tuple(get_category_label(pct, RAINFALL_LABELS) for pct in range(101))
+_RUNOFF_LBL = tuple(get_category_label(pct, RUNOFF_LABELS) for pct in range(101))
+_LATRINE_LBL = tuple(get_category_label(pct, LATRINE_LABELS) for pct in range(101))
+_TURBIDITY_LBL = tuple(get_category_label(pct, TURBIDITY_LABELS) for pct in range(101))
+_PUMP_LBL = tuple(get_category_label(pct, PUMP_LABELS) for pct in range(101))
+
+_RAINFALL_HTML = _pct_html_table(_RAINFALL_LBL, "<hr/>")
+_RUNOFF_HTML = _pct_html_table(_RUNOFF_LBL, "<hr/>")
+_LATRINE_HTML = _pct_html_table(_LATRINE_LBL)
+_TURBIDITY_HTML = _pct_html_table(_TURBIDITY_LBL, "<hr/>")
+_PUMP_HTML = _pct_html_table(_PUMP_LBL)
+
+
+@st.cache_data(ttl="30s", show_spinner=False)
 def check_api_health():
-    """Check if backend API is available."""
+    """Check if backend API is available (cached for 30 seconds)."""
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=5)
+        client = _httpx_client()
+        if client is not None:
+            return client.get("/health", timeout=httpx.Timeout(5.0, connect=3.0)).status_code == 200
+        response = _api_session().get(f"{API_BASE_URL}/health", timeout=(3, 5))
         return response.status_code == 200
     except:
         return False
 
 
+def _transport():
+    """HTTP/2 client when available, otherwise the requests session."""
+    client = _httpx_client()
+    return client if client is not None else _api_session()
+
+
+def _post_json(path, transport=None, **kwargs):
+    """
+    POST to the API, streaming the body in chunks.
+    
+    The response is read inside a context manager so its connection goes
+    back to the pool as soon as the body has been consumed. Uses the given
+    transport, or looks it up with _transport().
+    
+    Returns:
+        Tuple of (status code, decoded JSON body or None if empty)
+    """
+    if transport is None:
+        transport = _transport()
+    
+    if not isinstance(transport, requests.Session):
+        with transport.stream("POST", path, **kwargs) as response:
+            body = b"".join(response.iter_bytes(chunk_size=64 * 1024))
+            return response.status_code, (json.loads(body) if body else None)
+    
+    with transport.post(
+        f"{API_BASE_URL}{path}",
+        timeout=(3, 10),
+        stream=True,
+        **kwargs
+    ) as response:
+        body = b"".join(response.iter_content(chunk_size=64 * 1024))
+        return response.status_code, (json.loads(body) if body else None)
+
+
+class APIError(Exception):
+    """Non-200 response from the backend API, carrying its error detail."""
+
+
+class BatchNotSupported(Exception):
+    """Backend without the /predict-batch endpoint (raised so it is never cached)."""
+
+
+# Observation fields the model uses; school/reporter details are not part
+# of inference, so they are left out of the prediction cache key
+EVIDENCE_FIELDS = ("rainfall", "turbidity", "surface_runoff", "latrine_distance")
+
+
+def _observation_key(observations):
+    """Canonical cache key for a set of observations."""
+    return tuple(observations[field] for field in EVIDENCE_FIELDS)
+
+
+def _raise_for_api_error(status_code, body):
+    """Raise APIError for a non-200 response (so it is never cached)."""
+    if status_code != 200:
+        raise APIError((body or {}).get('detail', 'Unknown error'))
+
+
+@st.cache_data(ttl="10m", max_entries=512, show_spinner=False)
+def _cached_predict(key):
+    """Contamination prediction for an observation key, cached client-side."""
+    status_code, body = _post_json("/predict", json=dict(zip(EVIDENCE_FIELDS, key)))
+    _raise_for_api_error(status_code, body)
+    return body
+
+
+@st.cache_data(ttl="10m", max_entries=512, show_spinner=False)
+def _cached_combined_predict(key, pump_age):
+    """
+    Contamination and pump predictions for an observation key, cached client-side.
+    
+    Raises BatchNotSupported when the backend has no /predict-batch endpoint.
+    """
+    status_code, body = _post_json(
+        "/predict-batch",
+        json={"obs": dict(zip(EVIDENCE_FIELDS, key)), "pump_age": pump_age}
+    )
+    if status_code == 404:
+        raise BatchNotSupported()
+    _raise_for_api_error(status_code, body)
+    return body['contamination'], body['pump']
+
+
+def _parallel_predictions(key, pump_age):
+    """
+    Call /predict and /predict-pump concurrently, for backends without /predict-batch.
+    
+    The pump request runs in a worker thread (with the transport looked up
+    on the script thread) while the contamination prediction goes through
+    _cached_predict. A failed pump call gives no pump result and, being
+    outside the cache, is retried on the next assessment.
+    """
+    pump_future = _pool().submit(_post_json, "/predict-pump", _transport(), params={"pump_age": pump_age})
+    result = _cached_predict(key)
+    pump_status, pump_body = pump_future.result()
+    return result, (pump_body if pump_status == 200 else None)
+
+
 def get_prediction(observations):
-    """Get contamination prediction from API."""
+    """Get contamination prediction from API (repeat inputs are served from cache)."""
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/predict",
-            json=observations,
-            timeout=10
-        )
-        if response.status_code == 200:
-            return response.json()
-        else:
-            st.error(f"API Error: {response.json().get('detail', 'Unknown error')}")
-            return None
-    except requests.exceptions.ConnectionError:
+        return _cached_predict(_observation_key(observations))
+    except APIError as e:
+        st.error(f"API Error: {e}")
+        return None
+    except CONNECTION_ERRORS:
         st.error("⚠️ Cannot connect to backend API. Please ensure the server is running.")
         return None
     except Exception as e:
@@ -166,27 +414,55 @@ def get_prediction(observations):
 def get_pump_prediction(pump_age):
     """Get pump status prediction from API."""
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/predict-pump",
-            params={"pump_age": pump_age},
-            timeout=10
-        )
-        if response.status_code == 200:
-            return response.json()
+        status_code, body = _post_json("/predict-pump", params={"pump_age": pump_age})
+        if status_code == 200:
+            return body
         else:
             return None
     except:
         return None
 
 
-def create_risk_gauge(probability):
-    """Create a gauge chart for risk visualization."""
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=probability * 100,
+def get_combined_prediction(observations, pump_age):
+    """
+    Get contamination and pump predictions from API in one request.
+    
+    Returns:
+        Tuple of (contamination result, pump result), or (None, None) on error
+    """
+    try:
+        key = _observation_key(observations)
+        try:
+            return _cached_combined_predict(key, pump_age)
+        except BatchNotSupported:
+            return _parallel_predictions(key, pump_age)
+    except APIError as e:
+        st.error(f"API Error: {e}")
+        return None, None
+    except CONNECTION_ERRORS:
+        st.error("⚠️ Cannot connect to backend API. Please ensure the server is running.")
+        return None, None
+    except Exception as e:
+        st.error(f"Error: {str(e)}")
+        return None, None
+
+
+@st.cache_resource
+def _gauge_templates():
+    """
+    Build the styled gauge figures once per process.
+    
+    Returns:
+        Tuple of (contamination risk gauge, pump failure gauge) templates
+    """
+    # Imported here so plotly is only loaded once a gauge is needed
+    import plotly.graph_objects as go
+    
+    risk_gauge = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=0,
         domain={'x': [0, 1], 'y': [0, 1]},
         title={'text': "Contamination Risk (%)", 'font': {'size': 24}},
-        delta={'reference': 20, 'increasing': {'color': "red"}},
         gauge={
             'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
             'bar': {'color': "darkblue"},
@@ -207,53 +483,292 @@ def create_risk_gauge(probability):
         }
     ))
     
-    fig.update_layout(
+    risk_gauge.update_layout(
         height=300,
         margin=dict(l=20, r=20, t=50, b=20)
     )
     
-    return fig
+    pump_gauge = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=0,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Failure Risk (%)"},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "darkred"},
+            'steps': [
+                {'range': [0, 15], 'color': "lightgreen"},
+                {'range': [15, 30], 'color': "orange"},
+                {'range': [30, 100], 'color': "lightcoral"}
+            ]
+        }
+    ))
+    
+    return risk_gauge, pump_gauge
 
 
-def display_risk_result(result):
-    """Display risk assessment result with appropriate styling."""
-    risk_level = result['risk_level']
-    prob = result['contamination_probability']
-    
-    # Determine CSS class
-    css_class_map = {
-        'LOW': 'risk-low',
-        'MODERATE': 'risk-moderate',
-        'HIGH': 'risk-high',
-        'CRITICAL': 'risk-critical'
-    }
-    css_class = css_class_map.get(risk_level, 'risk-moderate')
-    
-    # Emoji map
-    emoji_map = {
-        'LOW': '✅',
-        'MODERATE': '⚠️',
-        'HIGH': '🚨',
-        'CRITICAL': '🔴'
-    }
-    emoji = emoji_map.get(risk_level, '⚠️')
+@st.cache_data(max_entries=256, show_spinner=False)
+def _cached_gauge(prob_permille, kind):
+    """
+    Gauge figure spec for a probability bucket, cached across reruns.
     
-    st.markdown(f"""
+    Each cache hit gets its own copy, so no figure is shared between
+    sessions.
+    
+    Args:
+        prob_permille: Probability in thousandths (0-1000)
+        kind: 'risk' for contamination, 'pump' for pump failure
+    
+    Returns:
+        Plotly figure as a plain dict (cheap to store and copy out of the cache)
+    """
+    risk_gauge, pump_gauge = _gauge_templates()
+    fig = copy.deepcopy(risk_gauge if kind == 'risk' else pump_gauge)
+    fig.data[0].value = prob_permille / 10
+    return fig.to_dict()
+
+
+def create_risk_gauge(probability):
+    """Create a gauge chart for risk visualization."""
+    return _cached_gauge(int(round(probability * 1000)), 'risk')
+
+
+def create_pump_gauge(probability):
+    """Create a gauge chart for pump failure risk."""
+    return _cached_gauge(int(round(probability * 1000)), 'pump')
+
+
+def _fmt(ts):
+    """Format an epoch timestamp from the history for display."""
+    return datetime.fromtimestamp(int(ts)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _fmt_column(ts):
+    """Format a column of epoch timestamps, one strftime per distinct second."""
+    seconds = np.asarray(ts, dtype=np.float64).astype(np.int64)
+    unique, inverse = np.unique(seconds, return_inverse=True)
+    return np.array([_fmt(int(t)) for t in unique], dtype=object)[inverse]
+
+
+def _empty_history():
+    """
+    Empty history store: structured buffer, text columns and the live row range.
+    
+    Rows before 'start' have been dropped from the history; they are only
+    waiting to be discarded when the buffer is next compacted.
+    """
+    hist = {'buf': np.empty(HISTORY_CAPACITY, dtype=HIST_DTYPE), 'start': 0, 'n_used': 0}
+    for name in HIST_TEXT_FIELDS:
+        hist[name] = []
+    return hist
+
+
+def _compact_history(hist, capacity):
+    """Move the live rows to the front of a buffer of `capacity`."""
+    start, n = hist['start'], hist['n_used']
+    keep = n - start
+    buf = np.empty(capacity, dtype=HIST_DTYPE)
+    buf[:keep] = hist['buf'][start:n]
+    hist['buf'], hist['start'], hist['n_used'] = buf, 0, keep
+    for name in HIST_TEXT_FIELDS:
+        hist[name] = hist[name][start:n]
+
+
+def _drop_oldest(hist, maxlen):
+    """Drop the oldest rows so at most `maxlen` remain in the history."""
+    hist['start'] = max(hist['start'], hist['n_used'] - maxlen)
+
+
+def _append_history(entry):
+    """
+    Append an assessment to the history store.
+    
+    Acts as a ring buffer: only the newest history_maxlen rows are kept.
+    Older rows are dropped as soon as the cap is exceeded and discarded when
+    the buffer fills; the buffer doubles only if the cap itself does not fit.
+    """
+    maxlen = st.session_state.get("history_maxlen", HISTORY_MAXLEN)
+    hist = st.session_state.hist
+    capacity = len(hist['buf'])
+    if hist['n_used'] == capacity:
+        live = hist['n_used'] - hist['start']
+        _compact_history(hist, capacity * 2 if live == capacity else capacity)
+    
+    hist['buf'][hist['n_used']] = tuple(entry[name] for name in HIST_DTYPE.names)
+    for name in HIST_TEXT_FIELDS:
+        hist[name].append(entry[name])
+    hist['n_used'] += 1
+    _drop_oldest(hist, maxlen)
+
+
+def _resize_history():
+    """Apply a new history size from the sidebar, dropping the oldest entries."""
+    _drop_oldest(st.session_state.hist, st.session_state.history_maxlen)
+
+
+def _history_rows():
+    """Index range of the rows currently in the history."""
+    hist = st.session_state.hist
+    return hist['start'], hist['n_used']
+
+
+def _history_frame():
+    """History as a DataFrame built from the buffer columns (no per-row dicts)."""
+    import pandas as pd
+    
+    hist = st.session_state.hist
+    start, stop = _history_rows()
+    rows = hist['buf'][start:stop]
+    cols = {name: rows[name] for name in HIST_DTYPE.names}
+    for name in HIST_TEXT_FIELDS:
+        cols[name] = hist[name][start:stop]
+    cols['risk_level'] = pd.Categorical.from_codes(cols['risk_level'], categories=RISK_LEVELS)
+    return pd.DataFrame({name: cols[name] for name in HISTORY_FIELDS})
+
+
+def _history_key():
+    """Cheap cache key for the history: row count and latest timestamp."""
+    start, stop = _history_rows()
+    if stop == start:
+        return 0, 0.0
+    return stop - start, float(st.session_state.hist['buf']['timestamp'][stop - 1])
+
+
+def _history_summary(rows):
+    """Summary statistics for the History tab, straight from the buffer rows."""
+    n_rows = len(rows)
+    # HIGH and CRITICAL are the top two risk codes
+    high_risk_count = int(np.count_nonzero(rows['risk_level'] >= RISK_CODES['HIGH']))
+    avg_prob = float(rows['probability'].mean(dtype=np.float64)) if n_rows else 0.0
+    return n_rows, high_risk_count, avg_prob
+
+
+def _history_display(df):
+    """History table formatted for display."""
+    display_df = df[['timestamp', 'school', 'location', 'reporter', 'rainfall_pct', 'turbidity_pct', 'risk_level', 'probability']].copy()
+    display_df['timestamp'] = _fmt_column(display_df['timestamp'])
+    percent = display_df['probability'].to_numpy(dtype=np.float64) * 100.0
+    display_df['probability'] = np.char.add(np.char.mod('%.1f', percent), '%')
+    display_df.columns = ['Time', 'School', 'Location', 'Reporter', 'Rainfall %', 'Turbidity %', 'Risk', 'Contamination %']
+    return display_df
+
+
+def _history_csv(df):
+    """
+    History exported as CSV.
+    
+    Returns:
+        Tuple of (file name dated by the latest assessment, CSV bytes)
+    """
+    export_df = df.copy()
+    export_df['timestamp'] = _fmt_column(export_df['timestamp'])
+    latest = datetime.fromtimestamp(df['timestamp'].max())
+    file_name = f"water_quality_history_{latest.strftime('%Y%m%d')}.csv"
+    
+    # Write encoded output straight into a byte buffer (no intermediate str)
+    buffer = io.BytesIO()
+    export_df.to_csv(buffer, index=False, encoding="utf-8")
+    return file_name, buffer.getvalue()
+
+
+def _history_view():
+    """
+    Summary, display table and CSV for the current history.
+    
+    Kept in session state against the history key, so reruns with an
+    unchanged history skip building the DataFrame. Each session's history
+    stays in its own session state, never in a process-wide cache.
+    
+    Returns:
+        Tuple of (summary, display DataFrame, (CSV file name, CSV bytes))
+    """
+    key = _history_key()
+    view = st.session_state.get("history_view")
+    if view is None or view[0] != key:
+        start, stop = _history_rows()
+        summary = _history_summary(st.session_state.hist['buf'][start:stop])
+        df = _history_frame()
+        view = (key, summary, _history_display(df), _history_csv(df))
+        st.session_state.history_view = view
+    return view[1:]
+
+
+# Risk result styling, keyed by risk level
+_CSS_CLASS = {
+    'LOW': 'risk-low',
+    'MODERATE': 'risk-moderate',
+    'HIGH': 'risk-high',
+    'CRITICAL': 'risk-critical'
+}
+
+_EMOJI = {
+    'LOW': '✅',
+    'MODERATE': '⚠️',
+    'HIGH': '🚨',
+    'CRITICAL': '🔴'
+}
+
+_TPL = """
         <div class="{css_class}">
             <h2>{emoji} Risk Level: {risk_level}</h2>
             <p style="font-size: 18px;">Contamination Probability: {prob:.1%}</p>
-            <p style="font-size: 16px;"><b>Recommendation:</b> {result['recommendation']}</p>
-            <p style="font-size: 14px; color: #666;">Confidence: {result['confidence']}</p>
+            <p style="font-size: 16px;"><b>Recommendation:</b> {recommendation}</p>
+            <p style="font-size: 14px; color: #666;">Confidence: {confidence}</p>
         </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+def display_risk_result(result):
+    """Display risk assessment result with appropriate styling."""
+    risk_level = result['risk_level']
+    
+    st.markdown(_TPL.format(
+        css_class=_CSS_CLASS.get(risk_level, 'risk-moderate'),
+        emoji=_EMOJI.get(risk_level, '⚠️'),
+        risk_level=risk_level,
+        prob=result['contamination_probability'],
+        recommendation=result['recommendation'],
+        confidence=result['confidence']
+    ), unsafe_allow_html=True)
+
+
+@st.fragment(run_every="5s")
+def api_health_badge():
+    """
+    Show backend API status, polling in the background.
+    
+    Runs as a fragment so only the badge rerenders on each poll. The result
+    is stored in st.session_state.api_ok to enable/disable API actions.
+    """
+    api_ok = check_api_health()
+    
+    if api_ok:
+        st.success("✅ Connected to backend API")
+    else:
+        st.warning("❌ Backend API not available. Please start the server with: `cd backend && uvicorn app:app --reload`")
+        if st.button("🔄 Recheck API"):
+            check_api_health.clear()
+            st.rerun(scope="fragment")
+    
+    if api_ok != st.session_state.get("api_ok", True):
+        st.session_state.api_ok = api_ok
+        # Rerun the whole app so the action buttons pick up the new status
+        st.rerun()
 
 
 # ============================================================================
 # SESSION STATE INITIALIZATION
 # ============================================================================
 
-if 'history' not in st.session_state:
-    st.session_state.history = []
+# Slider values live under fixed keys so they survive switching views
+# (re-assigning keeps Streamlit from dropping state of unrendered widgets)
+for slider_key, default in SLIDER_DEFAULTS.items():
+    st.session_state[slider_key] = st.session_state.get(slider_key, default)
+
+if 'hist' not in st.session_state:
+    # Preallocated record buffer; the oldest assessments are dropped once
+    # the history size cap is reached
+    st.session_state.hist = _empty_history()
 
 # ============================================================================
 # MAIN APP
@@ -264,22 +779,30 @@ st.title("💧 Blue Schools Water Quality Monitor")
 st.markdown("### Real-time Water Contamination Risk Assessment")
 st.markdown("---")
 
-# Check API status
-api_healthy = check_api_health()
-
-if api_healthy:
-    st.success("✅ Connected to backend API")
-else:
-    st.error("❌ Backend API not available. Please start the server with: `cd backend && uvicorn app:app --reload`")
-    st.stop()
+# Check API status (the rest of the page renders without waiting on it)
+api_health_badge()
 
 # Sidebar for school information
 with st.sidebar:
     st.header("📍 School Information")
     
-    school_name = st.text_input("School Name", placeholder="e.g., GPS Kano")
-    location = st.text_input("Location", placeholder="e.g., Kano City")
-    reporter_name = st.text_input("Your Name", placeholder="e.g., Musa Ahmed")
+    # Read back through st.session_state by the tab fragments
+    st.text_input("School Name", placeholder="e.g., GPS Kano", key="school_name")
+    st.text_input("Location", placeholder="e.g., Kano City", key="location")
+    st.text_input("Your Name", placeholder="e.g., Musa Ahmed", key="reporter_name")
+    
+    st.markdown("---")
+    
+    st.number_input(
+        "History size",
+        min_value=50,
+        max_value=5000,
+        value=HISTORY_MAXLEN,
+        step=50,
+        key="history_maxlen",
+        on_change=_resize_history,
+        help="Maximum number of assessments kept in this session; the oldest are dropped first"
+    )
     
     st.markdown("---")
     
@@ -296,132 +819,116 @@ with st.sidebar:
     Contact: support@blueschools.org
     """)
 
-# Main content area with tabs
-tab1, tab2, tab3, tab4 = st.tabs(["🔍 Risk Assessment", "🔧 Pump Status", "📊 History", "📚 Guide"])
+# Main content area: only the selected view is rendered on each run
+VIEWS = ("🔍 Risk Assessment", "🔧 Pump Status", "📊 History", "📚 Guide")
+active_tab = st.radio("View", VIEWS, horizontal=True, key="active_tab", label_visibility="collapsed")
 
 # ============================================================================
 # TAB 1: RISK ASSESSMENT
 # ============================================================================
 
-with tab1:
-    st.header("Water Quality Observations")
+# Each tab body is a fragment, so moving a slider only reruns its own tab
+
+@st.fragment
+def render_assessment_tab():
+    school_name = st.session_state.get("school_name", "")
+    location = st.session_state.get("location", "")
+    reporter_name = st.session_state.get("reporter_name", "")
     
-    col1, col2 = st.columns(2)
+    st.header("Water Quality Observations")
     
-    with col1:
-        st.subheader("Environmental Factors")
-        
-        # Rainfall Slider (0-100%)
-        st.markdown("**Recent Rainfall**")
-        rainfall_pct = st.slider(
-            "Rainfall Intensity",
-            min_value=0,
-            max_value=100,
-            value=50,
-            help="Slide to indicate rainfall intensity in the past 24 hours",
-            label_visibility="collapsed"
-        )
-        
-        # Show current category
-        rainfall_labels = ["☀️ Low/None (0-33%)", "🌧️ Medium (34-66%)", "⛈️ Heavy (67-100%)"]
-        current_rainfall = get_category_label(rainfall_pct, rainfall_labels)
-        st.markdown(f"""
-            <div class="percentage-display">
-                {rainfall_pct}% - {current_rainfall}
-            </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("---")
+    # Inputs are batched in a form: moving a slider does not rerun the
+    # tab, only the submit button does
+    with st.form("assess_form", border=False):
+        col1, col2 = st.columns(2)
         
-        # Surface Runoff Slider (0-100%)
-        st.markdown("**Surface Water Runoff**")
-        runoff_pct = st.slider(
-            "Surface Runoff Presence",
-            min_value=0,
-            max_value=100,
-            value=0,
-            help="Slide to indicate amount of surface water runoff observed",
-            label_visibility="collapsed"
-        )
+        # Slider headings are the slider labels, and each percentage display
+        # carries the divider after it, to keep the element count down
+        with col1:
+            st.subheader("Environmental Factors")
+            
+            # Rainfall Slider (0-100%)
+            rainfall_pct = st.slider(
+                "**Recent Rainfall**",
+                min_value=0,
+                max_value=100,
+                help="Slide to indicate rainfall intensity in the past 24 hours",
+                key="rainfall_pct"
+            )
+            
+            # Show current category
+            current_rainfall = _RAINFALL_LBL[rainfall_pct]
+            st.markdown(_RAINFALL_HTML[rainfall_pct], unsafe_allow_html=True)
+            
+            # Surface Runoff Slider (0-100%)
+            runoff_pct = st.slider(
+                "**Surface Water Runoff**",
+                min_value=0,
+                max_value=100,
+                help="Slide to indicate amount of surface water runoff observed",
+                key="runoff_pct"
+            )
+            
+            current_runoff = _RUNOFF_LBL[runoff_pct]
+            st.markdown(_RUNOFF_HTML[runoff_pct], unsafe_allow_html=True)
+            
+            st.subheader("Infrastructure")
+            
+            # Latrine Distance Slider (0-100%)
+            latrine_pct = st.slider(
+                "**Latrine Distance from Borehole**",
+                min_value=0,
+                max_value=100,
+                help="0% = Too close (<30m), 100% = Safe distance (>30m)",
+                key="latrine_pct"
+            )
+            
+            current_latrine = _LATRINE_LBL[latrine_pct]
+            st.markdown(_LATRINE_HTML[latrine_pct], unsafe_allow_html=True)
         
-        runoff_labels = ["❌ No runoff (0-50%)", "✅ Runoff present (51-100%)"]
-        current_runoff = get_category_label(runoff_pct, runoff_labels)
-        st.markdown(f"""
-            <div class="percentage-display">
-                {runoff_pct}% - {current_runoff}
-            </div>
-        """, unsafe_allow_html=True)
+        with col2:
+            st.subheader("Water Quality Indicators")
+            
+            # Turbidity Slider (0-100%)
+            turbidity_pct = st.slider(
+                "**Water Clarity (Turbidity)**",
+                min_value=0,
+                max_value=100,
+                help="Hold a glass of water up to light. Slide to indicate how cloudy it is",
+                key="turbidity_pct"
+            )
+            
+            current_turbidity = _TURBIDITY_LBL[turbidity_pct]
+            st.markdown(_TURBIDITY_HTML[turbidity_pct], unsafe_allow_html=True)
+            
+            # Visual guide
+            st.info("""
+            **💡 Turbidity Guide:**
+            - **0-33%**: Crystal clear water
+            - **34-66%**: Slightly hazy/cloudy
+            - **67-100%**: Very cloudy, cannot see through
+            """)
         
         st.markdown("---")
         
-        st.subheader("Infrastructure")
+        # Assessment button
+        col_btn1, col_btn2, col_btn3 = st.columns([1, 2, 1])
         
-        # Latrine Distance Slider (0-100%)
-        st.markdown("**Latrine Distance from Borehole**")
-        latrine_pct = st.slider(
-            "Latrine Safety",
-            min_value=0,
-            max_value=100,
-            value=100,
-            help="0% = Too close (<30m), 100% = Safe distance (>30m)",
-            label_visibility="collapsed"
-        )
-        
-        latrine_labels = ["⚠️ Too close (<30m)", "✅ Safe (>30m)"]
-        current_latrine = get_category_label(latrine_pct, latrine_labels)
-        st.markdown(f"""
-            <div class="percentage-display">
-                {latrine_pct}% - {current_latrine}
-            </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.subheader("Water Quality Indicators")
-        
-        # Turbidity Slider (0-100%)
-        st.markdown("**Water Clarity (Turbidity)**")
-        turbidity_pct = st.slider(
-            "Turbidity Level",
-            min_value=0,
-            max_value=100,
-            value=0,
-            help="Hold a glass of water up to light. Slide to indicate how cloudy it is",
-            label_visibility="collapsed"
-        )
-        
-        turbidity_labels = ["💎 Clear (0-33%)", "☁️ Slightly Cloudy (34-66%)", "🌫️ Very Cloudy (67-100%)"]
-        current_turbidity = get_category_label(turbidity_pct, turbidity_labels)
-        st.markdown(f"""
-            <div class="percentage-display">
-                {turbidity_pct}% - {current_turbidity}
-            </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Visual guide
-        st.info("""
-        **💡 Turbidity Guide:**
-        - **0-33%**: Crystal clear water
-        - **34-66%**: Slightly hazy/cloudy
-        - **67-100%**: Very cloudy, cannot see through
-        """)
-    
-    st.markdown("---")
-    
-    # Assessment button
-    col_btn1, col_btn2, col_btn3 = st.columns([1, 2, 1])
-    
-    with col_btn2:
-        assess_button = st.button("🔍 ASSESS CONTAMINATION RISK", type="primary", use_container_width=True)
+        with col_btn2:
+            submitted = st.form_submit_button(
+                "🔍 ASSESS CONTAMINATION RISK",
+                type="primary",
+                use_container_width=True,
+                disabled=not st.session_state.get("api_ok", True)
+            )
     
-    if assess_button:
+    if submitted:
         with st.spinner("Analyzing water quality..."):
             # Convert percentages to categories
-            rainfall = percentage_to_category(rainfall_pct, 3)
-            turbidity = percentage_to_category(turbidity_pct, 3)
-            surface_runoff = percentage_to_category(runoff_pct, 2)
-            latrine_distance = percentage_to_category(latrine_pct, 2)
+            rainfall = int(_LUT3[rainfall_pct])
+            turbidity = int(_LUT3[turbidity_pct])
+            surface_runoff = int(_LUT2[runoff_pct])
+            latrine_distance = int(_LUT2[latrine_pct])
             
             # Prepare observation data
             observations = {
@@ -434,72 +941,89 @@ with tab1:
                 "reporter_name": reporter_name
             }
             
-            # Get prediction
-            result = get_prediction(observations)
+            # Get prediction, together with the pump status once the user has
+            # checked a pump age on the Pump Status tab (saves a round trip)
+            if st.session_state.get("pump_checked"):
+                pump_age = int(_LUT3[st.session_state.pump_age_pct])
+                result, pump_result = get_combined_prediction(observations, pump_age)
+            else:
+                result, pump_result = get_prediction(observations), None
             
             if result:
-                st.success("✅ Analysis complete!")
-                
-                # Display school information if provided
-                if school_name or location or reporter_name:
-                    st.info(f"""
-                    **📍 Assessment Details:**
-                    - School: {school_name or 'Not provided'}
-                    - Location: {location or 'Not provided'}
-                    - Assessed by: {reporter_name or 'Not provided'}
-                    - Time: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-                    
-                    **📊 Input Percentages:**
-                    - Rainfall: {rainfall_pct}% ({current_rainfall})
-                    - Turbidity: {turbidity_pct}% ({current_turbidity})
-                    - Surface Runoff: {runoff_pct}% ({current_runoff})
-                    - Latrine Distance: {latrine_pct}% ({current_latrine})
-                    """)
-                
-                # Display gauge
-                st.plotly_chart(
-                    create_risk_gauge(result['contamination_probability']),
-                    use_container_width=True
-                )
-                
-                # Display result
-                display_risk_result(result)
-                
-                # Additional details in expander
-                with st.expander("📋 Technical Details"):
-                    col_detail1, col_detail2 = st.columns(2)
-                    
-                    with col_detail1:
-                        st.metric("Safe Probability", f"{result['safe_probability']:.1%}")
-                        st.metric("Contamination Probability", f"{result['contamination_probability']:.1%}")
-                    
-                    with col_detail2:
-                        st.metric("Confidence Level", result['confidence'])
-                        st.text(f"Timestamp: {result['timestamp']}")
-                    
-                    st.json(result['evidence_used'])
-                
                 # Save to history with percentages
+                # (numeric fields downcast to their HIST_DTYPE types)
                 history_entry = {
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'timestamp': time.time(),
                     'school': school_name or "Unknown",
                     'location': location or "Unknown",
                     'reporter': reporter_name or "Unknown",
-                    'rainfall_pct': rainfall_pct,
-                    'turbidity_pct': turbidity_pct,
-                    'runoff_pct': runoff_pct,
-                    'latrine_pct': latrine_pct,
-                    'risk_level': result['risk_level'],
-                    'probability': result['contamination_probability'],
-                    'observations': observations
+                    'rainfall_pct': np.uint8(rainfall_pct),
+                    'turbidity_pct': np.uint8(turbidity_pct),
+                    'runoff_pct': np.uint8(runoff_pct),
+                    'latrine_pct': np.uint8(latrine_pct),
+                    'risk_level': np.int8(RISK_CODES.get(result['risk_level'], UNKNOWN_RISK_CODE)),
+                    'probability': np.float32(result['contamination_probability'])
                 }
-                st.session_state.history.append(history_entry)
+                _append_history(history_entry)
+                
+                # Rerun the whole app so the History tab picks up the new
+                # entry; the result is shown once on that run
+                st.session_state.last_assessment = (result, pump_result, history_entry['timestamp'])
+                st.rerun()
+    
+    last_assessment = st.session_state.pop("last_assessment", None)
+    if last_assessment:
+        result, pump_result, assessed_at = last_assessment
+        st.success("✅ Analysis complete!")
+        
+        # Display school information if provided
+        if school_name or location or reporter_name:
+            st.info(f"""
+            **📍 Assessment Details:**
+            - School: {school_name or 'Not provided'}
+            - Location: {location or 'Not provided'}
+            - Assessed by: {reporter_name or 'Not provided'}
+            - Time: {_fmt(int(assessed_at))}
+            
+            **📊 Input Percentages:**
+            - Rainfall: {rainfall_pct}% ({current_rainfall})
+            - Turbidity: {turbidity_pct}% ({current_turbidity})
+            - Surface Runoff: {runoff_pct}% ({current_runoff})
+            - Latrine Distance: {latrine_pct}% ({current_latrine})
+            """)
+        
+        # Display gauge
+        st.plotly_chart(
+            create_risk_gauge(result['contamination_probability']),
+            use_container_width=True
+        )
+        
+        # Display result
+        display_risk_result(result)
+        
+        # Additional details in expander
+        with st.expander("📋 Technical Details"):
+            col_detail1, col_detail2 = st.columns(2)
+            
+            with col_detail1:
+                st.metric("Safe Probability", f"{result['safe_probability']:.1%}")
+                st.metric("Contamination Probability", f"{result['contamination_probability']:.1%}")
+            
+            with col_detail2:
+                st.metric("Confidence Level", result['confidence'])
+                st.text(f"Timestamp: {result['timestamp']}")
+                if pump_result:
+                    st.metric("Pump Failure Risk", f"{pump_result['failure_probability']:.1%}")
+            
+            st.json(result['evidence_used'])
+
 
 # ============================================================================
 # TAB 2: PUMP STATUS
 # ============================================================================
 
-with tab2:
+@st.fragment
+def render_pump_tab():
     st.header("🔧 Pump Failure Assessment")
     
     st.info("Assess the likelihood of pump failure based on age and condition.")
@@ -512,24 +1036,24 @@ with tab2:
             "Pump Age Percentage",
             min_value=0,
             max_value=100,
-            value=0,
             help="0% = New (<2yr), 50% = Medium (2-5yr), 100% = Old (>5yr)",
-            label_visibility="collapsed"
+            label_visibility="collapsed",
+            key="pump_age_pct"
         )
         
-        pump_labels = ["🆕 New (<2 years)", "⚙️ Medium (2-5 years)", "🔧 Old (>5 years)"]
-        current_pump = get_category_label(pump_age_pct, pump_labels)
-        st.markdown(f"""
-            <div class="percentage-display">
-                {pump_age_pct}% - {current_pump}
-            </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_PUMP_HTML[pump_age_pct], unsafe_allow_html=True)
         
-        check_pump_button = st.button("Check Pump Status", type="primary")
+        check_pump_button = st.button(
+            "Check Pump Status",
+            type="primary",
+            disabled=not st.session_state.get("api_ok", True)
+        )
     
     with col_pump2:
         if check_pump_button:
-            pump_age = percentage_to_category(pump_age_pct, 3)
+            # From now on assessments include the pump status as well
+            st.session_state.pump_checked = True
+            pump_age = int(_LUT3[pump_age_pct])
             pump_result = get_pump_prediction(pump_age)
             
             if pump_result:
@@ -541,82 +1065,64 @@ with tab2:
                     st.success(pump_result['recommendation'])
                 
                 # Pump status gauge
-                fig_pump = go.Figure(go.Indicator(
-                    mode="gauge+number",
-                    value=pump_result['failure_probability'] * 100,
-                    domain={'x': [0, 1], 'y': [0, 1]},
-                    title={'text': "Failure Risk (%)"},
-                    gauge={
-                        'axis': {'range': [None, 100]},
-                        'bar': {'color': "darkred"},
-                        'steps': [
-                            {'range': [0, 15], 'color': "lightgreen"},
-                            {'range': [15, 30], 'color': "orange"},
-                            {'range': [30, 100], 'color': "lightcoral"}
-                        ]
-                    }
-                ))
+                fig_pump = create_pump_gauge(pump_result['failure_probability'])
                 st.plotly_chart(fig_pump, use_container_width=True)
 
+
 # ============================================================================
 # TAB 3: HISTORY
 # ============================================================================
 
-with tab3:
+@st.fragment
+def render_history_tab():
     st.header("📊 Assessment History")
     
-    if st.session_state.history:
-        # Convert to DataFrame
-        df = pd.DataFrame(st.session_state.history)
+    if st.session_state.hist['n_used']:
+        summary, display_df, (csv_name, csv_bytes) = _history_view()
+        total, high_risk_count, avg_prob = summary
         
         # Summary statistics
         col_stat1, col_stat2, col_stat3 = st.columns(3)
         
         with col_stat1:
-            st.metric("Total Assessments", len(df))
+            st.metric("Total Assessments", total)
         
         with col_stat2:
-            high_risk_count = len(df[df['risk_level'].isin(['HIGH', 'CRITICAL'])])
             st.metric("High Risk Cases", high_risk_count)
         
         with col_stat3:
-            avg_prob = df['probability'].mean()
             st.metric("Average Risk", f"{avg_prob:.1%}")
         
         st.markdown("---")
         
         # Display history table with percentages
-        display_df = df[['timestamp', 'school', 'location', 'reporter', 'rainfall_pct', 'turbidity_pct', 'risk_level', 'probability']].copy()
-        display_df['probability'] = display_df['probability'].apply(lambda x: f"{x:.1%}")
-        display_df.columns = ['Time', 'School', 'Location', 'Reporter', 'Rainfall %', 'Turbidity %', 'Risk', 'Contamination %']
-        
         st.dataframe(display_df, use_container_width=True, hide_index=True)
         
-        # Export button
-        if st.button("📥 Export History as CSV"):
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="Download CSV",
-                data=csv,
-                file_name=f"water_quality_history_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv"
-            )
+        # Export button (CSV is built only when history changes)
+        st.download_button(
+            label="📥 Export History as CSV",
+            data=csv_bytes,
+            file_name=csv_name,
+            mime="text/csv"
+        )
         
         # Clear history button
         if st.button("🗑️ Clear History", type="secondary"):
-            st.session_state.history = []
+            st.session_state.hist = _empty_history()
+            st.session_state.pop("history_view", None)
             st.rerun()
     else:
         st.info("No assessments yet. Complete a risk assessment to see history here.")
 
+
 # ============================================================================
 # TAB 4: USER GUIDE
 # ============================================================================
 
-with tab4:
-    st.header("📚 User Guide")
-    
-    st.markdown("""
+@st.cache_resource
+def _guide_md():
+    """User guide markdown, built once per process."""
+    return """
     ### How to Use This Tool (Version 2.0 - Enhanced)
     
     #### 1️⃣ Gather Observations
@@ -629,7 +1135,7 @@ with tab4:
     
     #### 2️⃣ Adjust Percentage Sliders
     - **NEW!** Use continuous sliders (0-100%) for precise input
-    - See real-time category labels as you slide
+    - The category label under each slider updates when you click Assess
     - Current percentage is displayed prominently
     
     **Slider Guide:**
@@ -654,7 +1160,7 @@ with tab4:
     ### What's in this Version 1.0
     
     ✅ **Continuous Percentage Sliders**: More precise control (0-100%)  
-    ✅ **Real-time Category Display**: See category as you move slider  
+    ✅ **Category Display**: See the category for each assessed percentage  
     ✅ **Percentage History**: Track exact values over time  
     ✅ **Enhanced Visual Feedback**: Clear percentage indicators  
     
@@ -685,7 +1191,26 @@ with tab4:
     **Developed by**: Ismail Usman and Blue Team Project  
     **Version**: 1.0 
     **Last Updated**: February 2026
-    """)
+    """
+
+
+def render_guide_tab():
+    st.header("📚 User Guide")
+    
+    st.markdown(_guide_md())
+
+
+# ============================================================================
+# VIEW ROUTING
+# ============================================================================
+
+VIEW_RENDERERS = {
+    VIEWS[0]: render_assessment_tab,
+    VIEWS[1]: render_pump_tab,
+    VIEWS[2]: render_history_tab,
+    VIEWS[3]: render_guide_tab
+}
+VIEW_RENDERERS[active_tab]()
 
 # Footer
 st.markdown("---")